@@ -13,6 +13,7 @@ from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN
 from .services import async_register_services, async_unregister_services
+from .themes import load_themes
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -45,6 +46,9 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         if not hass.data[DOMAIN]:
             await async_unregister_services(hass)
 
+            # Drop cached themes so a reload picks up changes to themes.json
+            load_themes.cache_clear()
+
     return unload_ok
 
 
@@ -318,7 +318,26 @@ async def get_config_entry_for_device_entity(
     Returns:
         ConfigEntry if found, None otherwise
     """
-    entity_registry = er.async_get(hass)
+    return get_config_entry_from_registry(hass, er.async_get(hass), entity_id, domain)
+
+
+def get_config_entry_from_registry(
+    hass: HomeAssistant, entity_registry: er.EntityRegistry, entity_id: str, domain: str
+) -> ConfigEntry | None:
+    """Get the config entry for an entity using an already fetched entity registry.
+
+    Synchronous variant of get_config_entry_for_device_entity for resolving many
+    entities without re-fetching the registry for each one.
+
+    Args:
+        hass: Home Assistant instance
+        entity_registry: Entity registry to look the entity up in
+        entity_id: Entity ID (can be camera, image, or sensor)
+        domain: The integration domain (e.g., "tibber_graph")
+
+    Returns:
+        ConfigEntry if found, None otherwise
+    """
     entity_entry = entity_registry.async_get(entity_id)
 
     if not entity_entry:
@@ -6,6 +6,8 @@ import matplotlib.colors as mcolors
 import matplotlib.patheffects as pe
 import matplotlib.pyplot as plt
 import matplotlib.ticker as mticker
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 
 # Import helper functions
 from .helpers import ensure_timezone
@@ -341,13 +343,13 @@ def render_plot_to_path(
         now_local: Current local time as datetime
         idx: Index of current price in raw data
         currency: Currency code string (e.g., "€", "SEK", "öre")
-        out_path: Output file path for the rendered image
+        out_path: Output file path for the rendered image, or a writable binary file-like object
         render_options: Optional dict of rendering options to override defaults.py values
         translations: Optional dict of translated strings for rendered labels (e.g., {"label_at": "at"})
     """
     # Matplotlib imports and rc settings are prepared at module import to
     # minimize per-render overhead.
-    # Use the module-level plt, mticker, pe that were imported earlier.
+    # Use the module-level Figure, mticker, pe that were imported earlier.
 
     # Apply render options if provided, otherwise use global config values
     if render_options is None:
@@ -462,14 +464,14 @@ def render_plot_to_path(
         # Return without modifying the output file to preserve last valid render
         return
 
-    # Clean up any existing figures before creating new ones
-    plt.close("all")
-
     fig_w = (CANVAS_WIDTH_OPT if FORCE_FIXED_SIZE_OPT else width) / 200
     fig_h = (CANVAS_HEIGHT_OPT if FORCE_FIXED_SIZE_OPT else height) / 200
 
-    # Create new figure with explicit reference
-    fig = plt.figure(figsize=(fig_w, fig_h), dpi=200)
+    # Create the figure directly rather than through pyplot, so it is never
+    # registered in pyplot's global figure list and concurrent renders in
+    # other threads cannot close it mid-draw
+    fig = Figure(figsize=(fig_w, fig_h), dpi=200)
+    FigureCanvasAgg(fig)
     fig.patch.set_facecolor(BACKGROUND_COLOR)
 
     # Create axes
@@ -1676,19 +1678,23 @@ def render_plot_to_path(
     temp_path = None
 
     try:
-        # Create temporary file in same directory as output to ensure same filesystem
-        # This allows atomic rename operation
-        out_dir = os.path.dirname(out_path)
-        temp_fd, temp_path = tempfile.mkstemp(suffix='.png', dir=out_dir)
-        os.close(temp_fd)  # Close the file descriptor; savefig will open it
+        if hasattr(out_path, "write"):
+            # File-like target (e.g. io.BytesIO): no existing image to protect
+            fig.savefig(out_path, format="png", facecolor=fig.get_facecolor())
+        else:
+            # Create temporary file in same directory as output to ensure same filesystem
+            # This allows atomic rename operation
+            out_dir = os.path.dirname(out_path)
+            temp_fd, temp_path = tempfile.mkstemp(suffix='.png', dir=out_dir)
+            os.close(temp_fd)  # Close the file descriptor; savefig will open it
 
-        # Save to temporary file with correct figure background to avoid white edges
-        fig.savefig(temp_path, facecolor=fig.get_facecolor())
+            # Save to temporary file with correct figure background to avoid white edges
+            fig.savefig(temp_path, facecolor=fig.get_facecolor())
 
-        # Only replace the actual output file if render succeeded
-        # This is atomic on most filesystems, preventing partial/corrupt images
-        os.replace(temp_path, out_path)
-        temp_path = None  # Mark as successfully moved
+            # Only replace the actual output file if render succeeded
+            # This is atomic on most filesystems, preventing partial/corrupt images
+            os.replace(temp_path, out_path)
+            temp_path = None  # Mark as successfully moved
 
     except Exception as err:
         # If rendering fails, preserve the existing output file
@@ -1707,5 +1713,4 @@ def render_plot_to_path(
 
         # Clean up matplotlib objects to prevent memory leaks
         ax.clear()
-        plt.close(fig)
-        plt.close("all")
+        fig.clear()
@@ -1,6 +1,7 @@
 """Service handlers for Tibber Graph integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
@@ -14,6 +15,7 @@ from homeassistant.helpers import config_validation as cv, entity_registry as er
 from .themes import get_theme_names, validate_custom_theme
 from .helpers import (
     get_config_entry_for_device_entity,
+    get_config_entry_from_registry,
     validate_sensor_entity,
     get_entity_friendly_name,
     generate_entity_name_from_tibber,
@@ -866,15 +868,19 @@ async def async_handle_delete_graph(call: ServiceCall) -> None:
     if isinstance(entity_ids, str):
         entity_ids = [entity_ids]
 
-    # Process each entity
+    # Resolve all entities against a single registry snapshot, one entry per device
+    entity_registry = er.async_get(hass)
+    entries_to_delete: dict[str, tuple[str, ConfigEntry]] = {}
     for entity_id in entity_ids:
-        try:
-            # Get the config entry for this entity (works with camera, image, or sensor)
-            config_entry = await get_config_entry_for_device_entity(hass, entity_id, DOMAIN)
-            if not config_entry:
-                _LOGGER.warning("Skipping %s: not found or is not a Tibber Graph entity", entity_id)
-                continue
+        # Get the config entry for this entity (works with camera, image, or sensor)
+        config_entry = get_config_entry_from_registry(hass, entity_registry, entity_id, DOMAIN)
+        if not config_entry:
+            _LOGGER.warning("Skipping %s: not found or is not a Tibber Graph entity", entity_id)
+            continue
+        entries_to_delete.setdefault(config_entry.entry_id, (entity_id, config_entry))
 
+    async def _delete_entry(entity_id: str, config_entry: ConfigEntry) -> None:
+        try:
             # Get entity name for logging
             entity_name = config_entry.data.get(CONF_ENTITY_NAME, "Unknown")
 
@@ -886,3 +892,7 @@ async def async_handle_delete_graph(call: ServiceCall) -> None:
 
         except Exception as err:
             _LOGGER.error("Failed to delete entity %s: %s", entity_id, err)
+
+    await asyncio.gather(
+        *(_delete_entry(entity_id, config_entry) for entity_id, config_entry in entries_to_delete.values())
+    )
@@ -3,16 +3,19 @@ from __future__ import annotations
 
 import json
 import logging
+from collections.abc import Mapping
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 _LOGGER = logging.getLogger(__name__)
 
-# Cache for loaded themes to avoid repeated file reads
-_THEMES_CACHE: dict[str, dict[str, Any]] | None = None
+# Location of the built-in theme definitions
+_THEMES_FILE = Path(__file__).resolve().parent / "themes.json"
 
 # Required theme fields - must all be present in any custom theme
-REQUIRED_THEME_FIELDS = {
+REQUIRED_THEME_FIELDS = frozenset({
     "avgline_color",
     "avgline_style",
     "axis_label_color",
@@ -39,28 +42,28 @@ REQUIRED_THEME_FIELDS = {
     "spine_color",
     "tick_color",
     "tickline_color",
-}
+})
 
 
-def load_themes() -> dict[str, dict[str, Any]]:
+@lru_cache(maxsize=None)
+def load_themes() -> dict[str, Mapping[str, Any]]:
     """Load themes from themes.json file.
 
+    The result is cached after the first call; use `load_themes.cache_clear()`
+    to force a re-read. Each theme is wrapped in a read-only mapping so it can
+    be shared with renderers without copying.
+
     Returns:
         Dictionary mapping theme names to their color configurations.
         Example: {"dark": {...}, "light": {...}}
     """
-    global _THEMES_CACHE
-
-    if _THEMES_CACHE is not None:
-        return _THEMES_CACHE
-
-    themes_file = Path(__file__).parent / "themes.json"
-
-    with open(themes_file, "r", encoding="utf-8") as f:
-        _THEMES_CACHE = json.load(f)
+    themes = {
+        name: MappingProxyType(config)
+        for name, config in json.loads(_THEMES_FILE.read_bytes()).items()
+    }
 
-    _LOGGER.debug("Loaded %d themes from themes.json", len(_THEMES_CACHE))
-    return _THEMES_CACHE
+    _LOGGER.debug("Loaded %d themes from themes.json", len(themes))
+    return themes
 
 
 def get_theme_names() -> list[str]:
@@ -73,14 +76,15 @@ def get_theme_names() -> list[str]:
     return list(themes.keys())
 
 
-def get_theme_config(theme_name: str, custom_theme: dict[str, Any] | None = None) -> dict[str, Any]:
+def get_theme_config(theme_name: str, custom_theme: dict[str, Any] | None = None) -> Mapping[str, Any]:
     """Get configuration for a specific theme and optionally overlay a custom theme.
 
     If `custom_theme` is provided it will be merged on top of the named built-in theme.
     Properties omitted from `custom_theme` will be taken from the built-in theme. If
     `theme_name` is not found, falls back to the "dark" theme.
 
-    Returns a full theme dict (no missing keys) for safe consumption by renderers.
+    Returns a full theme mapping (no missing keys) for safe consumption by renderers.
+    Without a custom theme this is the shared read-only built-in theme.
     """
     themes = load_themes()
 
@@ -88,7 +92,7 @@ def get_theme_config(theme_name: str, custom_theme: dict[str, Any] | None = None
         _LOGGER.warning("Theme '%s' not found, falling back to 'dark' theme", theme_name)
         theme_name = "dark"
 
-    base = dict(themes.get(theme_name, {}))
+    base = themes.get(theme_name, MappingProxyType({}))
 
     # If a custom theme is provided, overlay it onto the base theme so omitted
     # properties take their values from the selected built-in theme.
@@ -96,8 +100,10 @@ def get_theme_config(theme_name: str, custom_theme: dict[str, Any] | None = None
         if not isinstance(custom_theme, dict):
             _LOGGER.warning("Custom theme provided is not a dict; ignoring custom theme")
         else:
-            base.update(custom_theme)
-            _LOGGER.debug("Applied custom theme overrides on top of theme '%s'", theme_name)
+            base = {**base, **custom_theme}
+            # Called on every render; skip logger dispatch when debug is off
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Applied custom theme overrides on top of theme '%s'", theme_name)
 
     return base
 
@@ -112,12 +118,11 @@ def validate_custom_theme(theme_config: dict[str, Any]) -> tuple[bool, str]:
         return False, "Theme config must be a dictionary"
 
     # Only allow keys that exist in built-in themes (prevent typos and unknown props)
-    allowed_keys = set()
-    for t in load_themes().values():
-        allowed_keys.update(t.keys())
+    allowed_keys = frozenset().union(*load_themes().values())
 
-    unknown_keys = set(theme_config.keys()) - allowed_keys
-    if unknown_keys:
+    # Only build the list of unknown keys when there is at least one
+    if not allowed_keys.issuperset(theme_config):
+        unknown_keys = set(theme_config).difference(allowed_keys)
         return False, f"Unknown theme properties: {', '.join(sorted(unknown_keys))}"
 
     # Helper validators
@@ -12,225 +12,87 @@ Usage:
 
 This will generate a rendered graph image at 'local/local_render.png'.
 """
+import argparse
 import datetime
+from bisect import bisect_right
 import json
 import sys
 from pathlib import Path
 
+# Prefer orjson for JSON parsing when available (orjson.JSONDecodeError subclasses json.JSONDecodeError)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Parse command-line arguments before loading anything, so --help returns immediately
+_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+_parser.set_defaults(config_mode='test')  # 'test', 'wearos', 'defaults', or 'old_defaults'
+_parser.add_argument('--wearos', '-w', dest='config_mode', action='store_const', const='wearos',
+                     help="use Wear OS configuration (dark theme, hourly, öre)")
+_parser.add_argument('--defaults', '-d', dest='config_mode', action='store_const', const='defaults',
+                     help="use only defaults.py (pure defaults, no overrides)")
+_parser.add_argument('--old-defaults', '-o', dest='config_mode', action='store_const', const='old_defaults',
+                     help="use old default values (before recent changes)")
+_parser.add_argument('--random', '-r', dest='use_random_data', action='store_true',
+                     help="use random generated price data instead of real Tibber data")
+_parser.add_argument('--time', '-t', dest='fixed_time', metavar='HH:MM',
+                     help="simulate a specific time today (e.g., 19:34)")
+_parser.add_argument('--publish', '-p', dest='publish_mode', action='store_true',
+                     help="resize to 590px, add border/rounded corners, black bg if transparent")
+_parser.add_argument('--custom-theme', '-c', dest='custom_theme_json', metavar='JSON',
+                     help="use a custom theme from a JSON string")
+_args = _parser.parse_args()
+
+config_mode = _args.config_mode
+use_random_data = _args.use_random_data
+fixed_time = _args.fixed_time
+publish_mode = _args.publish_mode  # Combines resize, border/corners, and black background for transparent images
+custom_theme_json = _args.custom_theme_json  # Custom theme config as JSON string
+
+_MODE_MESSAGES = {
+    'wearos': "Running with Wear OS configuration (inline settings)",
+    'defaults': "Running with defaults only (no configuration overrides)",
+    'old_defaults': "Running with old default values (before recent changes)",
+}
+if config_mode in _MODE_MESSAGES:
+    print(_MODE_MESSAGES[config_mode])
+if use_random_data:
+    print("Using randomly generated price data")
+if fixed_time:
+    print(f"Simulating time: {fixed_time}")
+if publish_mode:
+    print("Publish mode: will resize, add border/rounded corners, and convert transparent to black")
+if custom_theme_json:
+    print("Using custom theme configuration")
+
 # Add parent directory to path to import test_helpers
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from test_helpers import load_price_data_from_json, parse_time_string
-
-# Check for command-line arguments
-config_mode = 'test'  # 'test', 'wearos', 'defaults', or 'old_defaults'
-use_random_data = False
-fixed_time = None
-publish_mode = False  # Combines resize, border/corners, and black background for transparent images
-custom_theme_json = None  # Custom theme config as JSON string
-
-i = 1
-while i < len(sys.argv):
-    arg = sys.argv[i]
-    if arg in ('--wearos', '-w'):
-        config_mode = 'wearos'
-        print("Running with Wear OS configuration (inline settings)")
-    elif arg in ('--defaults', '-d'):
-        config_mode = 'defaults'
-        print("Running with defaults only (no configuration overrides)")
-    elif arg in ('--old-defaults', '-o'):
-        config_mode = 'old_defaults'
-        print("Running with old default values (before recent changes)")
-    elif arg in ('--random', '-r'):
-        use_random_data = True
-        print("Using randomly generated price data")
-    elif arg in ('--time', '-t'):
-        if i + 1 < len(sys.argv):
-            fixed_time = sys.argv[i + 1]
-            print(f"Simulating time: {fixed_time}")
-            i += 1  # Skip next argument
-        else:
-            print("Error: --time requires a time argument (e.g., --time 19:34)")
-            sys.exit(1)
-    elif arg in ('--publish', '-p'):
-        publish_mode = True
-        print("Publish mode: will resize, add border/rounded corners, and convert transparent to black")
-    elif arg in ('--custom-theme', '-c'):
-        if i + 1 < len(sys.argv):
-            custom_theme_json = sys.argv[i + 1]
-            print(f"Using custom theme configuration")
-            i += 1  # Skip next argument
-        else:
-            print("Error: --custom-theme requires a JSON string argument")
-            sys.exit(1)
-    elif arg in ('--help', '-h'):
-        print(__doc__)
-        sys.exit(0)
-    else:
-        print(f"Unknown argument: {arg}")
-        print("Use --help for usage information")
-        sys.exit(1)
-    i += 1
-
-# Load the constants and rendering code without importing the package
-# This avoids Home Assistant dependencies
-component_dir = Path(__file__).parent.parent.parent / "custom_components" / "tibber_graph"
-
-# Read and execute defaults.py to load all default constants
-defaults_file = component_dir / "defaults.py"
-with open(defaults_file, 'r', encoding='utf-8') as f:
-    defaults_code = f.read()
-    exec(defaults_code, globals())
-
-# Read and execute const.py to get DEFAULT_* constants (skipping imports)
-const_file = component_dir / "const.py"
-with open(const_file, 'r', encoding='utf-8') as f:
-    const_code = f.read()
-    # Remove the import section and domain definition
-    import re
-    # Remove everything up to "# Default values imported from defaults.py"
-    const_code = re.sub(
-        r'^.*?# Default values imported from defaults\.py',
-        '# Default values imported from defaults.py',
-        const_code,
-        flags=re.DOTALL | re.MULTILINE
-    )
-    # Remove the DOMAIN line and config entry keys section (everything before DEFAULT_*)
-    const_code = re.sub(
-        r'DOMAIN = .*?\n\n.*?(?=# Default values)',
-        '',
-        const_code,
-        flags=re.DOTALL
-    )
-    exec(const_code, globals())
+from test_helpers import (
+    COMPONENT_DIR,
+    LOCAL_TZ,
+    load_aggregate_to_hourly,
+    load_price_data_from_json,
+    parse_time_string,
+    register_component_package,
+)
+
+# Load the constants and rendering code without importing the Home Assistant integration
+register_component_package()
 
 # No additional loading needed - all modes use defaults.py as base
 # Test modes will apply render_options inline in main()
-
-# Load ensure_timezone function from helpers.py (without importing Home Assistant dependencies)
-# Define it directly to avoid import issues
-from dateutil import tz
-
-# Reuse local timezone object
-LOCAL_TZ = tz.tzlocal()
-
-def ensure_timezone(dt, tz_info=None):
-    """Ensure a datetime object has timezone information.
-
-    Args:
-        dt: datetime object to check
-        tz_info: timezone to apply if missing (defaults to LOCAL_TZ)
-
-    Returns:
-        datetime object with timezone information
-    """
-    if tz_info is None:
-        tz_info = LOCAL_TZ
-    # For Python 3.11+, use replace() for all timezone objects
-    return dt if dt.tzinfo else dt.replace(tzinfo=tz_info)
-
-# Read and execute renderer.py (replacing relative imports)
-renderer_file = component_dir / "renderer.py"
-with open(renderer_file, 'r', encoding='utf-8') as f:
-    renderer_code = f.read()
-    # Replace the relative imports with nothing (constants already loaded)
-    # Remove the entire import section from const and defaults
-    renderer_code = re.sub(
-        r'^# Import default constants from const\.py.*?\n\)',
-        '# Constants already loaded from defaults.py and const.py',
-        renderer_code,
-        flags=re.DOTALL | re.MULTILINE
-    )
-    # Also remove the themes import since we'll define get_theme_config locally
-    renderer_code = re.sub(
-        r'^# Import theme loader for dynamic theme selection\nfrom \.themes import get_theme_config',
-        '# Theme loader defined locally',
-        renderer_code,
-        flags=re.MULTILINE
-    )
-    # Remove the helpers import
-    renderer_code = re.sub(
-        r'^# Import helper functions\nfrom \.helpers import ensure_timezone\n\n',
-        '',
-        renderer_code,
-        flags=re.MULTILINE
-    )
-    exec(renderer_code, globals())
-
-# Load theme validation function from themes.py
-# We only need the REQUIRED_THEME_FIELDS constant and validate_custom_theme function
-themes_file = component_dir / "themes.py"
-with open(themes_file, 'r', encoding='utf-8') as f:
-    themes_code = f.read()
-
-# Load themes.json for the get_theme_config function
-themes_json_file = component_dir / "themes.json"
-with open(themes_json_file, 'r', encoding='utf-8') as f:
-    _THEMES_DATA = json.load(f)
+from tibber_graph.defaults import CANVAS_HEIGHT, CANVAS_WIDTH, CURRENCY_OVERRIDE, USE_CENTS, USE_HOURLY_PRICES
+from tibber_graph.renderer import render_plot_to_path
 
 # Import validator from the component's themes.py so local behavior matches
-import importlib.util
-
-# Load themes module from the component directory so this script can be run
-# directly without relying on package imports.
-themes_path = component_dir / "themes.py"
-spec = importlib.util.spec_from_file_location("tibber_graph.themes", themes_path)
-themes_module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(themes_module)
-
-validate_custom_theme = themes_module.validate_custom_theme
-REQUIRED_THEME_FIELDS = getattr(themes_module, "REQUIRED_THEME_FIELDS", set())
-
-def get_theme_config(theme_name, custom_theme=None):
-    """Get configuration for a specific theme or merge with custom theme.
-
-    If `custom_theme` is provided it overlays values onto the built-in theme so
-    omitted values fall back to the selected theme's defaults.
-    """
-    if theme_name not in _THEMES_DATA:
-        print(f"Warning: Theme '{theme_name}' not found, falling back to 'dark' theme")
-        theme_name = "dark"
-
-    base = dict(_THEMES_DATA.get(theme_name, {}))
-    if custom_theme:
-        if not isinstance(custom_theme, dict):
-            print("Warning: custom_theme must be a dict; ignoring custom_theme")
-        else:
-            base.update(custom_theme)
-
-    return base
+from tibber_graph.themes import REQUIRED_THEME_FIELDS, validate_custom_theme
 
 # Import just the _aggregate_to_hourly function from camera.py
 # We extract and execute only the static method to avoid Home Assistant dependencies
 # This ensures the test code uses the exact same aggregation logic as the real component
-camera_file = component_dir / "camera.py"
-with open(camera_file, 'r', encoding='utf-8') as f:
-    camera_lines = f.readlines()
-    # Find and extract the _aggregate_to_hourly method
-    in_method = False
-    method_lines = []
-    for i, line in enumerate(camera_lines):
-        if 'def _aggregate_to_hourly(' in line:
-            in_method = True
-            # Remove @staticmethod decorator and adjust indentation
-            method_lines.append(line.replace('    def _aggregate_to_hourly', 'def aggregate_to_hourly'))
-        elif in_method:
-            # Check if we've reached the next method or class-level code
-            if line.strip() and not line.startswith(' ' * 8) and not line.startswith(' ' * 4 + '@'):
-                break
-            # Add line with reduced indentation (remove 4 spaces)
-            if line.startswith('        '):
-                method_lines.append(line[4:])
-            elif line.strip():
-                method_lines.append(line)
-            else:
-                method_lines.append(line)
-
-    aggregate_code = ''.join(method_lines)
-    exec(aggregate_code, globals())
-
-from dateutil import tz
-import json
-from PIL import Image, ImageDraw
+aggregate_to_hourly = load_aggregate_to_hourly(COMPONENT_DIR / "camera.py")
 
 # Configuration
 OUTPUT_FILE = Path(__file__).parent / "local_render.png"
@@ -239,14 +101,11 @@ PRICE_DATA_FILE = Path(__file__).parent / "local_render.json"
 # - CANVAS_WIDTH and CANVAS_HEIGHT
 # - CURRENCY_OVERRIDE
 
-# Local timezone
-LOCAL_TZ = tz.tzlocal()
-
 # Process and validate custom theme if provided
 custom_theme_config = None
 if custom_theme_json:
     try:
-        custom_theme_config = json.loads(custom_theme_json)
+        custom_theme_config = _json_loads(custom_theme_json)
         print(f"Parsed custom theme JSON successfully")
 
         # Validate the custom theme using the validation function from themes.py
@@ -271,10 +130,13 @@ def publish_image(image_path, resize_width=590, border_width=1, border_color=(61
         border_color: RGB tuple for border color (default: dark gray (61, 61, 61))
         corner_radius: Radius for rounded corners in pixels (default: 10)
     """
+    # Only needed in publish mode, so avoid the import cost on regular runs
+    from PIL import Image, ImageDraw
+
     img = Image.open(image_path)
 
-    # Step 1: Resize to target width
-    if resize_width:
+    # Step 1: Resize to target width (skip the LANCZOS pass if already at that width)
+    if resize_width and resize_width != img.width:
         original_size = img.size
         aspect_ratio = original_size[1] / original_size[0]
         new_height = int(resize_width * aspect_ratio)
@@ -286,65 +148,50 @@ def publish_image(image_path, resize_width=590, border_width=1, border_color=(61
     # Step 2: Determine if we need to add a black background (for transparent images)
     convert_transparent = img.mode == 'RGBA'
 
+    # Create rounded corner mask once (same geometry as the border)
+    mask = Image.new('L', (width, height), 0)
+    draw_mask = ImageDraw.Draw(mask)
+    draw_mask.rounded_rectangle([(0, 0), (width - 1, height - 1)], corner_radius, fill=255)
+
     # Step 3: Apply rounded corners with appropriate background
     if convert_transparent:
         # For transparent images, keep corners transparent and convert only the content area to black background
-        from PIL import ImageChops
-
         # First, flatten the transparent image onto black background
-        black_bg = Image.new('RGB', (width, height), (0, 0, 0))
-        black_bg.paste(img, (0, 0), img)
-
-        # Create rounded corner mask (use same coordinates as border will use)
-        mask = Image.new('L', (width, height), 0)
-        draw_mask = ImageDraw.Draw(mask)
-        draw_mask.rounded_rectangle([(0, 0), (width - 1, height - 1)], corner_radius, fill=255)
-
-        # Convert flattened image to RGBA
-        black_bg_rgba = black_bg.convert('RGBA')
-
-        # Use the mask as the alpha channel (corners will be transparent)
-        r, g, b, _ = black_bg_rgba.split()
-        result = Image.merge('RGBA', (r, g, b, mask))
-
+        result = Image.new('RGB', (width, height), (0, 0, 0))
+        result.paste(img, (0, 0), img)
         print(f"  → Converted transparent background to black with transparent rounded corners")
     else:
         # For RGB images, just apply rounded corners
         # Sample corners to detect background color
+        pixels = img.load()
         corner_pixels = [
-            img.getpixel((0, 0)),
-            img.getpixel((width-1, 0)),
-            img.getpixel((0, height-1)),
-            img.getpixel((width-1, height-1))
+            pixels[0, 0],
+            pixels[width-1, 0],
+            pixels[0, height-1],
+            pixels[width-1, height-1]
         ]
         avg_brightness = sum(sum(pixel[:3]) for pixel in corner_pixels) / (len(corner_pixels) * 3)
         bg_color = (0, 0, 0) if avg_brightness < 128 else (255, 255, 255)
 
         result = Image.new('RGB', (width, height), bg_color)
-        mask = Image.new('L', (width, height), 0)
-        draw_mask = ImageDraw.Draw(mask)
-        draw_mask.rounded_rectangle([(0, 0), (width - 1, height - 1)], corner_radius, fill=255)
         result.paste(img, (0, 0), mask)
         print(f"  → Applied rounded corners")
 
-    # Step 4: Draw border
+    # Step 4: Draw border (the outline lies inside the mask, so it stays opaque)
     draw = ImageDraw.Draw(result)
-    if result.mode == 'RGBA':
-        draw.rounded_rectangle(
-            [(0, 0), (width - 1, height - 1)],
-            corner_radius,
-            outline=border_color + (255,),  # Add alpha channel for RGBA
-            width=border_width
-        )
-    else:
-        draw.rounded_rectangle(
-            [(0, 0), (width - 1, height - 1)],
-            corner_radius,
-            outline=border_color,
-            width=border_width
-        )
+    draw.rounded_rectangle(
+        [(0, 0), (width - 1, height - 1)],
+        corner_radius,
+        outline=border_color,
+        width=border_width
+    )
     print(f"  → Added {border_width}px border")
 
+    if convert_transparent:
+        # Use the mask as the alpha channel (corners will be transparent)
+        result = result.convert('RGBA')
+        result.putalpha(mask)
+
     # Save the result
     result.save(image_path)
 
@@ -381,73 +228,80 @@ def generate_price_data(use_random=False, fixed_time=None):
         # - Evening peak (17:00-19:00): Second peak ~1.34-2.22
         # - Evening decline (19:00-23:00): Gradual decrease ~1.58-0.86
 
-        start_time = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        dates = []
-        prices = []
+        import numpy as np
 
-        import random
+        start_time = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        rng = np.random.default_rng()
 
         # 48 hours * 4 intervals per hour = 192 data points
-        for i in range(48 * 4):
-            interval_time = start_time + datetime.timedelta(minutes=i * 15)
+        count = 48 * 4
+        step = datetime.timedelta(minutes=15)
+        dates = []
+        interval_time = start_time
+        for _ in range(count):
             dates.append(interval_time)
+            interval_time += step
+
+        # Wall-clock position of each interval
+        minutes = np.arange(count) * 15
+        hour = minutes // 60 % 24
+        minute = minutes % 60
+
+        night = hour < 4                          # Night: Low and stable
+        early_morning = (hour >= 4) & (hour < 6)  # Early morning: Sharp rise
+        morning = (hour >= 6) & (hour < 9)        # Morning peak: Highest prices with high volatility
+        day = (hour >= 9) & (hour < 15)           # Day: High prices with volatility
+        afternoon = (hour >= 15) & (hour < 17)    # Afternoon: Moderate to high
+        evening = (hour >= 17) & (hour < 19)      # Evening peak: Second highest period
+        early_evening = (hour >= 19) & (hour < 21)  # Early evening: Declining
+        # Otherwise (21 <= hour < 24): Late evening, lower prices
+
+        # Base price patterns by hour (mimicking real Tibber data)
+        # Interpolated periods use their position within the two-hour range
+        base_price = np.select(
+            [night, early_morning, morning, day, afternoon, evening, early_evening],
+            [
+                rng.uniform(0.60, 0.82, count),
+                0.70 + (1.43 - 0.70) * ((hour - 4) / 2.0 + (minute / 60.0) / 2.0),
+                rng.uniform(1.50, 2.30, count),
+                rng.uniform(1.20, 1.90, count),
+                rng.uniform(1.15, 1.50, count),
+                rng.uniform(1.50, 2.00, count),
+                1.40 - (1.40 - 1.00) * ((hour - 19) / 2.0 + (minute / 60.0) / 2.0),
+            ],
+            default=rng.uniform(0.85, 1.05, count),
+        )
+
+        # Add spikes during the morning peak, day and evening peak
+        spike_probability = np.select([morning, day, evening], [0.3, 0.2, 0.25], default=0.0)
+        spike = np.select(
+            [morning, day, evening],
+            [rng.uniform(0.1, 0.4, count), rng.uniform(0.2, 0.5, count), rng.uniform(0.1, 0.3, count)],
+            default=0.0,
+        )
+        base_price += np.where(rng.random(count) < spike_probability, spike, 0.0)
+
+        # Second day tends to have slightly different prices
+        # Adjust second day to be slightly lower on average
+        second_day = minutes >= 24 * 60
+        base_price = np.where(second_day, base_price * rng.uniform(0.85, 0.95, count), base_price)
+
+        variation = np.select(
+            [night, early_morning, morning, day, afternoon, evening, early_evening],
+            [
+                rng.uniform(-0.02, 0.02, count),
+                rng.uniform(-0.15, 0.20, count),
+                rng.uniform(-0.20, 0.25, count),
+                rng.uniform(-0.15, 0.20, count),
+                rng.uniform(-0.10, 0.25, count),
+                rng.uniform(-0.20, 0.30, count),
+                rng.uniform(-0.15, 0.15, count),
+            ],
+            default=rng.uniform(-0.10, 0.10, count),
+        )
 
-            # Determine which day we're in for price adjustments
-            hour = interval_time.hour
-
-            # Base price patterns by hour (mimicking real Tibber data)
-            if 0 <= hour < 4:
-                # Night: Low and stable
-                base_price = random.uniform(0.60, 0.82)
-                variation = random.uniform(-0.02, 0.02)
-            elif 4 <= hour < 6:
-                # Early morning: Sharp rise
-                # Interpolate between 0.70 and 1.43 based on position in range
-                progress = (hour - 4) / 2.0 + (interval_time.minute / 60.0) / 2.0
-                base_price = 0.70 + (1.43 - 0.70) * progress
-                variation = random.uniform(-0.15, 0.20)
-            elif 6 <= hour < 9:
-                # Morning peak: Highest prices with high volatility
-                base_price = random.uniform(1.50, 2.30)
-                # Add spikes
-                if random.random() < 0.3:
-                    base_price += random.uniform(0.1, 0.4)
-                variation = random.uniform(-0.20, 0.25)
-            elif 9 <= hour < 15:
-                # Day: High prices with volatility
-                base_price = random.uniform(1.20, 1.90)
-                # Occasional spikes
-                if random.random() < 0.2:
-                    base_price += random.uniform(0.2, 0.5)
-                variation = random.uniform(-0.15, 0.20)
-            elif 15 <= hour < 17:
-                # Afternoon: Moderate to high
-                base_price = random.uniform(1.15, 1.50)
-                variation = random.uniform(-0.10, 0.25)
-            elif 17 <= hour < 19:
-                # Evening peak: Second highest period
-                base_price = random.uniform(1.50, 2.00)
-                # Add spikes
-                if random.random() < 0.25:
-                    base_price += random.uniform(0.1, 0.3)
-                variation = random.uniform(-0.20, 0.30)
-            elif 19 <= hour < 21:
-                # Early evening: Declining
-                progress = (hour - 19) / 2.0 + (interval_time.minute / 60.0) / 2.0
-                base_price = 1.40 - (1.40 - 1.00) * progress
-                variation = random.uniform(-0.15, 0.15)
-            else:  # 21 <= hour < 24
-                # Late evening: Lower prices
-                base_price = random.uniform(0.85, 1.05)
-                variation = random.uniform(-0.10, 0.10)
-
-            # Second day tends to have slightly different prices
-            if interval_time.date() > today:
-                # Adjust second day to be slightly lower on average
-                base_price *= random.uniform(0.85, 0.95)
-
-            price = max(0.50, base_price + variation)  # Ensure price doesn't go too low
-            prices.append(price)
+        # Ensure price doesn't go too low
+        prices = np.maximum(0.50, base_price + variation).tolist()
 
         return dates, prices, now
 
@@ -456,8 +310,7 @@ def generate_price_data(use_random=False, fixed_time=None):
     # (same format as entity attributes 'prices' or 'data')
     # Supported field names: `start_time|start|startsAt` for timestamp, `price|price_per_kwh|total` for value
     try:
-        with open(PRICE_DATA_FILE, 'r', encoding='utf-8') as f:
-            price_data_json = json.load(f)
+        price_data_json = _json_loads(PRICE_DATA_FILE.read_bytes())
     except FileNotFoundError:
         print(f"Error: Price data file not found: {PRICE_DATA_FILE}")
         print("Tip: Use --random flag to generate random data instead.")
@@ -482,12 +335,13 @@ def generate_price_data(use_random=False, fixed_time=None):
     # Print date mapping information
     if date_mapping:
         sorted_original = sorted(date_mapping.keys())
-        print(f"JSON contains data for {len(sorted_original)} day(s): {', '.join(str(d) for d in sorted_original)}")
+        print(f"JSON contains data for {len(sorted_original)} day(s): {', '.join(map(str, sorted_original))}")
 
         # Show mapping details
         yesterday = today - datetime.timedelta(days=1)
         tomorrow = today + datetime.timedelta(days=1)
 
+        mapping_lines = []
         for original_date in sorted_original:
             mapped_date = date_mapping[original_date]
             if mapped_date == yesterday:
@@ -499,7 +353,8 @@ def generate_price_data(use_random=False, fixed_time=None):
             else:
                 days_from_tomorrow = (mapped_date - tomorrow).days
                 label = f"tomorrow+{days_from_tomorrow}"
-            print(f"Mapping: {original_date} → {label}")
+            mapping_lines.append(f"Mapping: {original_date} → {label}")
+        print("\n".join(mapping_lines))
 
     return dates, prices, now
 
@@ -606,13 +461,8 @@ def main():
         print("Aggregating 15-minute data to hourly averages...")
         dates_raw, prices_raw = aggregate_to_hourly(dates_raw, prices_raw)
 
-    # Find current price index
-    idx = 0
-    for i, date in enumerate(dates_raw):
-        if date <= now_local:
-            idx = i
-        else:
-            break
+    # Find current price index (last interval starting at or before now)
+    idx = max(0, bisect_right(dates_raw, now_local) - 1)
 
     # Determine step size based on actual data interval
     if len(dates_raw) >= 2:
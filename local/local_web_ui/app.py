@@ -8,154 +8,82 @@ Usage:
 
 Then open http://localhost:5000 in your browser.
 """
+from collections import OrderedDict
 import datetime
+import hashlib
+from bisect import bisect_right
 import io
 import json
 import sys
+import threading
+import traceback
 from pathlib import Path
-from flask import Flask, render_template, request, send_file, jsonify
+from flask import Flask, Response, render_template, request, jsonify
+from flask.json.provider import DefaultJSONProvider
+from waitress import serve
+
+# Prefer orjson for Flask's JSON encoding/decoding when available
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Import shared test helpers
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from test_helpers import load_price_data_from_json, parse_time_string
+from test_helpers import (
+    COMPONENT_DIR,
+    LOCAL_TZ,
+    load_aggregate_to_hourly,
+    load_price_data_from_json,
+    parse_time_string,
+    register_component_package,
+)
 
 # Add the local_render directory to the path to use its utilities
 local_render_dir = Path(__file__).parent.parent / "local_render"
 sys.path.insert(0, str(local_render_dir))
 
-# Load the component directory path
-component_dir = Path(__file__).parent.parent.parent / "custom_components" / "tibber_graph"
-
 # Price data file location (in local/local_render/ folder)
 PRICE_DATA_FILE = Path(__file__).parent.parent / "local_render" / "local_render.json"
 
 # Load strings.json to get the list of available options
-strings_file = component_dir / "strings.json"
-with open(strings_file, 'r', encoding='utf-8') as f:
-    strings_data = json.load(f)
-    AVAILABLE_OPTIONS = list(strings_data['options']['step']['init']['data'].keys())
-
-# Read and execute defaults.py to load all default constants
-defaults_file = component_dir / "defaults.py"
-with open(defaults_file, 'r', encoding='utf-8') as f:
-    defaults_code = f.read()
-    exec(defaults_code, globals())
-
-# Read and execute const.py to get DEFAULT_* constants (skipping imports)
-const_file = component_dir / "const.py"
-with open(const_file, 'r', encoding='utf-8') as f:
-    const_code = f.read()
-    # Remove the import section and domain definition
-    import re
-    # Remove everything up to "# Default values imported from defaults.py"
-    const_code = re.sub(
-        r'^.*?# Default values imported from defaults\.py',
-        '# Default values imported from defaults.py',
-        const_code,
-        flags=re.DOTALL | re.MULTILINE
-    )
-    # Remove the DOMAIN line and config entry keys section (everything before DEFAULT_*)
-    const_code = re.sub(
-        r'DOMAIN = .*?\n\n.*?(?=# Default values)',
-        '',
-        const_code,
-        flags=re.DOTALL
-    )
-    exec(const_code, globals())
+strings_file = COMPONENT_DIR / "strings.json"
+strings_data = json.loads(strings_file.read_bytes())
+AVAILABLE_OPTIONS = list(strings_data['options']['step']['init']['data'].keys())
 
-# Load themes.py using importlib to avoid import issues
-import importlib.util
-spec = importlib.util.spec_from_file_location("themes", component_dir / "themes.py")
-themes_module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(themes_module)
-get_theme_config = themes_module.get_theme_config
+# Import the component modules without Home Assistant
+register_component_package()
 
-# Load ensure_timezone function from helpers.py (without importing Home Assistant dependencies)
-# Define it directly to avoid import issues
-from dateutil import tz
+# Default constants are looked up by name from defaults.py (see get_default_value)
+from tibber_graph import defaults
+from tibber_graph.renderer import render_plot_to_path
 
-# Reuse local timezone object
-LOCAL_TZ = tz.tzlocal()
+# Import the aggregation function from camera.py (compiled once and cached on disk)
+aggregate_to_hourly = load_aggregate_to_hourly(COMPONENT_DIR / "camera.py")
 
-def ensure_timezone(dt, tz_info=None):
-    """Ensure a datetime object has timezone information.
 
-    Args:
-        dt: datetime object to check
-        tz_info: timezone to apply if missing (defaults to LOCAL_TZ)
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, falling back to Flask's default() for other types."""
 
-    Returns:
-        datetime object with timezone information
-    """
-    if tz_info is None:
-        tz_info = LOCAL_TZ
-    # For Python 3.11+, use replace() for all timezone objects
-    return dt if dt.tzinfo else dt.replace(tzinfo=tz_info)
-
-# Read and execute renderer.py (replacing relative imports)
-renderer_file = component_dir / "renderer.py"
-with open(renderer_file, 'r', encoding='utf-8') as f:
-    renderer_code = f.read()
-    # Replace the relative imports with nothing (constants already loaded)
-    # Remove both import blocks: from .const and from .themes
-    renderer_code = re.sub(
-        r'# Import default constants from const\.py.*?\)',
-        '# Constants already loaded from defaults.py and const.py',
-        renderer_code,
-        flags=re.DOTALL
-    )
-    # Remove the themes import
-    renderer_code = re.sub(
-        r'# Import theme loader.*?from \.themes import get_theme_config',
-        '',
-        renderer_code,
-        flags=re.DOTALL
-    )
-    # Remove the helpers import
-    renderer_code = re.sub(
-        r'# Import helper functions\nfrom \.helpers import ensure_timezone\n\n',
-        '',
-        renderer_code
-    )
-    exec(renderer_code, globals())
-
-# Import the aggregation function from camera.py
-camera_file = component_dir / "camera.py"
-with open(camera_file, 'r', encoding='utf-8') as f:
-    camera_lines = f.readlines()
-    in_method = False
-    method_lines = []
-    for i, line in enumerate(camera_lines):
-        if 'def _aggregate_to_hourly(' in line:
-            in_method = True
-            method_lines.append(line.replace('    def _aggregate_to_hourly', 'def aggregate_to_hourly'))
-        elif in_method:
-            if line.strip() and not line.startswith(' ' * 8) and not line.startswith(' ' * 4 + '@'):
-                break
-            if line.startswith('        '):
-                method_lines.append(line[4:])
-            elif line.strip():
-                method_lines.append(line)
-            else:
-                method_lines.append(line)
-    aggregate_code = ''.join(method_lines)
-    exec(aggregate_code, globals())
-
-from dateutil import tz
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_SORT_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
-app = Flask(__name__)
 
-# Local timezone
-LOCAL_TZ = tz.tzlocal()
+app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 
 
 def get_default_value(option_key):
-    """Get the default value for a given option key from the loaded defaults.py globals."""
+    """Get the default value for a given option key from the loaded defaults.py module."""
     # Convert option key to uppercase constant name
     const_name = option_key.upper()
 
-    # Try to get the value from globals (loaded from defaults.py)
-    value = globals().get(const_name)
+    # Try to get the value from defaults.py
+    value = getattr(defaults, const_name, None)
 
     # Handle special cases where value might be None
     # Return empty string for UI display, but keep None for nullable options
@@ -174,48 +102,64 @@ def build_defaults_dict():
     return defaults
 
 
+# Defaults never change while the server runs, so build and encode them once
+_DEFAULTS = build_defaults_dict()
+_DEFAULTS_JSON = app.json.dumps(_DEFAULTS).encode()
+_DEFAULTS_ETAG = hashlib.md5(_DEFAULTS_JSON).hexdigest()
+
+
+# Boolean options (checkboxes)
+_BOOLEAN_OPTIONS = frozenset({
+    'transparent_background', 'force_fixed_size',
+    'show_horizontal_grid', 'show_average_price_line',
+    'show_vertical_grid', 'y_tick_use_colors',
+    'use_hourly_prices', 'use_cents',
+    'show_data_source_name',
+    'label_show_currency', 'label_use_colors',
+    'color_price_line_by_average', 'show_cheap_price_line'
+})
+
+# Integer options
+_INTEGER_OPTIONS = frozenset({
+    'canvas_width', 'canvas_height', 'x_tick_step_hours',
+    'hours_to_show', 'cheap_price_points', 'cheap_price_threshold', 'y_axis_label_rotation_deg', 'y_tick_count',
+    'label_font_size', 'price_decimals'
+})
+
+# Float options
+_FLOAT_OPTIONS = frozenset({'cheap_price_threshold'})
+
+# Integer options that can be empty
+_NULLABLE_STRING_OPTIONS = frozenset({'currency_override', 'y_tick_count', 'hours_to_show'})
+
+# Integer options where an empty value means None (auto)
+_NULLABLE_INT_OPTIONS = frozenset({'y_tick_count', 'price_decimals', 'hours_to_show'})
+
+# Hidden options not in strings.json (not exposed in UI but supported in YAML)
+_HIDDEN_OPTIONS = (
+    'cheap_boundary_highlight', 'show_cheap_price_line', 'label_use_colors', 'y_tick_use_colors',
+    'label_show_currency', 'show_data_source_name', 'data_source_name'
+)
+
+
 def parse_option_value(option_key, form_value, default_fallback):
     """Parse a form value based on the option type."""
-    # Boolean options (checkboxes)
-    boolean_options = [
-        'transparent_background', 'force_fixed_size',
-        'show_horizontal_grid', 'show_average_price_line',
-        'show_vertical_grid', 'y_tick_use_colors',
-        'use_hourly_prices', 'use_cents',
-        'show_data_source_name',
-        'label_show_currency', 'label_use_colors',
-        'color_price_line_by_average', 'show_cheap_price_line'
-    ]
-
-    # Integer options
-    integer_options = [
-        'canvas_width', 'canvas_height', 'x_tick_step_hours',
-        'hours_to_show', 'cheap_price_points', 'cheap_price_threshold', 'y_axis_label_rotation_deg', 'y_tick_count',
-        'label_font_size', 'price_decimals'
-    ]
-
-    # Float options
-    float_options = ['cheap_price_threshold']
-
-    # Integer options that can be empty
-    nullable_string_options = ['currency_override', 'y_tick_count', 'hours_to_show']
-
-    if option_key in boolean_options:
+    if option_key in _BOOLEAN_OPTIONS:
         return form_value == 'true'
-    elif option_key in float_options:
+    elif option_key in _FLOAT_OPTIONS:
         try:
             return float(form_value) if form_value else default_fallback
         except (ValueError, TypeError):
             return default_fallback
-    elif option_key in integer_options:
+    elif option_key in _INTEGER_OPTIONS:
         # Allow None for nullable integer options
-        if option_key in ('y_tick_count', 'price_decimals', 'hours_to_show') and not form_value:
+        if option_key in _NULLABLE_INT_OPTIONS and not form_value:
             return None
         try:
             return int(form_value) if form_value else default_fallback
         except (ValueError, TypeError):
             return default_fallback
-    elif option_key in nullable_string_options:
+    elif option_key in _NULLABLE_STRING_OPTIONS:
         return form_value if form_value else None
     else:
         # String options (theme, y_axis_side, start_graph_at, currency_override)
@@ -227,14 +171,13 @@ def build_render_options(form_data):
     render_options = {}
 
     for option_key in AVAILABLE_OPTIONS:
-        default_value = get_default_value(option_key)
+        default_value = _DEFAULTS[option_key]
         form_value = form_data.get(option_key, '')
 
         render_options[option_key] = parse_option_value(option_key, form_value, default_value)
 
     # Handle hidden options not in strings.json (not exposed in UI but supported in YAML)
-    hidden_options = ['cheap_boundary_highlight', 'show_cheap_price_line', 'label_use_colors', 'y_tick_use_colors', 'label_show_currency', 'show_data_source_name', 'data_source_name']
-    for option_key in hidden_options:
+    for option_key in _HIDDEN_OPTIONS:
         if option_key in form_data:
             default_value = get_default_value(option_key)
             form_value = form_data.get(option_key, '')
@@ -247,6 +190,12 @@ def build_render_options(form_data):
     return render_options
 
 
+# Parsed price data keyed by (file mtime, reference date, start_graph_at). Cached
+# lists are shared between requests and must not be modified in place.
+_price_data_cache = {}
+_price_data_cache_lock = threading.Lock()
+
+
 def load_price_data(fixed_time=None, start_graph_at=None):
     """Load price data from JSON file.
 
@@ -263,6 +212,18 @@ def load_price_data(fixed_time=None, start_graph_at=None):
 
     today = now.date()
 
+    try:
+        mtime_ns = PRICE_DATA_FILE.stat().st_mtime_ns
+    except OSError:
+        return None, None, now
+
+    # Re-parse only when the file or the date/filter settings change
+    cache_key = (mtime_ns, today, start_graph_at)
+    with _price_data_cache_lock:
+        cached = _price_data_cache.get(cache_key)
+    if cached is not None:
+        return cached[0], cached[1], now
+
     # Use shared helper to load and process price data
     try:
         dates, prices, date_mapping = load_price_data_from_json(
@@ -273,16 +234,72 @@ def load_price_data(fixed_time=None, start_graph_at=None):
     except RuntimeError:
         return None, None, now
 
+    # Entries for an older version of the file can never be hit again
+    with _price_data_cache_lock:
+        if any(key[0] != mtime_ns for key in _price_data_cache):
+            _price_data_cache.clear()
+        _price_data_cache[cache_key] = (dates, prices)
+
     return dates, prices, now
 
 
+# Rendered PNGs keyed by (render options, simulated time, price data file mtime),
+# so switching back to an earlier configuration skips matplotlib entirely
+_PNG_CACHE_SIZE = 32
+_png_cache = OrderedDict()
+_png_cache_lock = threading.Lock()
+
+
+def render_png(render_options, dates_raw, prices_raw, now_local):
+    """Render the graph for the given options and price data, returning PNG bytes."""
+    # Aggregate to hourly if configured
+    if render_options['use_hourly_prices']:
+        dates_raw, prices_raw = aggregate_to_hourly(dates_raw, prices_raw)
+
+    # Find current price index (last interval starting at or before now)
+    idx = max(0, bisect_right(dates_raw, now_local) - 1)
+
+    # Prepare data for rendering
+    if len(dates_raw) >= 2:
+        step_minutes = int((dates_raw[1] - dates_raw[0]).total_seconds() // 60) or (60 if render_options['use_hourly_prices'] else 15)
+    else:
+        step_minutes = 60 if render_options['use_hourly_prices'] else 15
+
+    interval_td = datetime.timedelta(minutes=step_minutes)
+    dates_plot = dates_raw + [dates_raw[-1] + interval_td]
+    prices_plot = prices_raw + [prices_raw[-1]]
+
+    # Determine currency: override if set, otherwise auto-select based on cents mode
+    if render_options['currency_override']:
+        currency = render_options['currency_override']
+    elif render_options['use_cents']:
+        currency = "¢"
+    else:
+        currency = "SEK"
+
+    # Render straight into memory
+    buf = io.BytesIO()
+    render_plot_to_path(
+        width=render_options['canvas_width'],
+        height=render_options['canvas_height'],
+        dates_plot=dates_plot,
+        prices_plot=prices_plot,
+        dates_raw=dates_raw,
+        prices_raw=prices_raw,
+        now_local=now_local,
+        idx=idx,
+        currency=currency,
+        out_path=buf,
+        render_options=render_options,
+    )
+    return buf.getvalue()
+
+
 @app.route('/')
 def index():
     """Render the main configuration page."""
-    # Build defaults dictionary dynamically from strings.json options
-    defaults = build_defaults_dict()
-
-    return render_template('index.html', defaults=defaults)
+    # Defaults dictionary built from strings.json options at startup
+    return render_template('index.html', defaults=_DEFAULTS)
 
 
 @app.route('/render', methods=['POST'])
@@ -307,71 +324,39 @@ def render_graph():
         if dates_raw is None or prices_raw is None:
             return jsonify({'error': 'Failed to load price data. Please ensure local_render.json exists in local/local_render/.'}), 400
 
-        # Aggregate to hourly if configured
-        if render_options['use_hourly_prices']:
-            dates_raw, prices_raw = aggregate_to_hourly(dates_raw, prices_raw)
-
-        # Find current price index
-        idx = 0
-        for i, date in enumerate(dates_raw):
-            if date <= now_local:
-                idx = i
-            else:
-                break
-
-        # Prepare data for rendering
-        if len(dates_raw) >= 2:
-            step_minutes = int((dates_raw[1] - dates_raw[0]).total_seconds() // 60) or (60 if render_options['use_hourly_prices'] else 15)
+        # Reuse the PNG of an earlier render with the same inputs. Renders at the
+        # real current time never repeat, so only simulated times are cached.
+        cached = None
+        if fixed_time:
+            cache_key = (tuple(sorted(render_options.items())), now_local, PRICE_DATA_FILE.stat().st_mtime_ns)
+            with _png_cache_lock:
+                cached = _png_cache.get(cache_key)
+                if cached is not None:
+                    _png_cache.move_to_end(cache_key)
+
+        if cached is None:
+            png = render_png(render_options, dates_raw, prices_raw, now_local)
+            cached = (png, hashlib.blake2b(png, digest_size=16).hexdigest())
+            # The renderer logs and writes nothing on failure; don't keep that result
+            if fixed_time and png:
+                with _png_cache_lock:
+                    _png_cache[cache_key] = cached
+                    if len(_png_cache) > _PNG_CACHE_SIZE:
+                        _png_cache.popitem(last=False)
+        png, etag = cached
+
+        # Let the page skip downloading and swapping in an identical image.
+        # Conditional requests are not handled by werkzeug for POST, so
+        # If-None-Match is checked here.
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
         else:
-            step_minutes = 60 if render_options['use_hourly_prices'] else 15
-
-        interval_td = datetime.timedelta(minutes=step_minutes)
-        dates_plot = dates_raw + [dates_raw[-1] + interval_td]
-        prices_plot = prices_raw + [prices_raw[-1]]
-
-        # Determine currency: override if set, otherwise auto-select based on cents mode
-        if render_options['currency_override']:
-            currency = render_options['currency_override']
-        elif render_options['use_cents']:
-            currency = "¢"
-        else:
-            currency = "SEK"
-
-        # Render to temporary file
-        import tempfile
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp_file:
-            tmp_path = tmp_file.name
-
-        try:
-            render_plot_to_path(
-                width=render_options['canvas_width'],
-                height=render_options['canvas_height'],
-                dates_plot=dates_plot,
-                prices_plot=prices_plot,
-                dates_raw=dates_raw,
-                prices_raw=prices_raw,
-                now_local=now_local,
-                idx=idx,
-                currency=currency,
-                out_path=tmp_path,
-                render_options=render_options,
-            )
-
-            # Read the file and send it
-            with open(tmp_path, 'rb') as f:
-                img_bytes = f.read()
-
-            return send_file(io.BytesIO(img_bytes), mimetype='image/png')
-        finally:
-            # Clean up temporary file
-            import os
-            try:
-                os.unlink(tmp_path)
-            except:
-                pass
+            response = Response(png, mimetype='image/png')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
 
     except Exception as e:
-        import traceback
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
@@ -379,8 +364,12 @@ def render_graph():
 @app.route('/defaults')
 def get_defaults():
     """Return all default configuration values."""
-    # Build defaults dictionary dynamically from strings.json options
-    return jsonify(build_defaults_dict())
+    # Serve the pre-encoded defaults, answering 304 if the client's copy is current
+    response = Response(_DEFAULTS_JSON, mimetype='application/json')
+    response.set_etag(_DEFAULTS_ETAG)
+    response.cache_control.public = True
+    response.cache_control.max_age = 60
+    return response.make_conditional(request)
 
 
 if __name__ == '__main__':
@@ -391,4 +380,7 @@ if __name__ == '__main__':
     print("Open your browser and navigate to: http://localhost:5000")
     print("\nPress Ctrl+C to stop the server.")
     print("=" * 70)
-    app.run(debug=True, port=5000)
+    if '--dev' in sys.argv[1:]:
+        app.run(debug=True, port=5000)
+    else:
+        serve(app, host='127.0.0.1', port=5000, threads=8)
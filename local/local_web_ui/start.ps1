@@ -19,7 +19,7 @@ if (-not (Test-Path $AppPath)) {
 $RequirementsPath = Join-Path $ScriptDir "requirements.txt"
 Write-Host "Checking dependencies..." -ForegroundColor Yellow
 try {
-    python -c "import flask; import dateutil" 2>$null
+    python -c "import flask; import dateutil; import waitress" 2>$null
     if ($LASTEXITCODE -ne 0) {
         throw "Dependencies not found"
     }
@@ -57,6 +57,14 @@ def test_validate_custom_theme_missing_fields():
     print("✓ Partial theme acceptance test passed")
 
 
+def test_validate_custom_theme_unknown_property():
+    """Test validation with a property not present in any built-in theme."""
+    is_valid, error = validate_custom_theme({"fill_color": "#7dc3ff", "fill_colour": "#7dc3ff"})
+    assert not is_valid, "Expected invalid for unknown property"
+    assert error == "Unknown theme properties: fill_colour", f"Expected unknown property error, got: {error}"
+    print(f"✓ Unknown property test passed: {error}")
+
+
 def test_validate_custom_theme_not_dict():
     """Test validation with non-dictionary input."""
     is_valid, error = validate_custom_theme("not a dict")
@@ -117,6 +125,23 @@ def test_get_theme_config_named_theme():
     print("✓ Named theme test passed (light)")
 
 
+def test_get_theme_config_named_theme_read_only():
+    """Test that built-in themes are shared read-only and overlays return a new dict."""
+    dark_config = get_theme_config("dark", None)
+    assert dark_config is get_theme_config("dark", None), "Expected built-in theme to be shared"
+    try:
+        dark_config["background_color"] = "#custom"
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("Expected built-in theme to be read-only")
+
+    overlay = get_theme_config("dark", {"background_color": "#custom"})
+    assert overlay["background_color"] == "#custom", "Expected overlay value"
+    assert dark_config["background_color"] == "#1c1c1c", "Expected built-in theme to be unchanged"
+    print("✓ Read-only named theme test passed")
+
+
 def test_required_fields_count():
     """Test that REQUIRED_THEME_FIELDS has the expected number of fields."""
     expected_count = 26  # Added avgline_style and cheapline_style
@@ -131,9 +156,11 @@ if __name__ == "__main__":
     try:
         test_validate_custom_theme_valid()
         test_validate_custom_theme_missing_fields()
+        test_validate_custom_theme_unknown_property()
         test_validate_custom_theme_not_dict()
         test_get_theme_config_custom_priority()
         test_get_theme_config_named_theme()
+        test_get_theme_config_named_theme_read_only()
         test_required_fields_count()
 
         print("\n✓ All tests passed!")
@@ -4,17 +4,78 @@ This module provides common functionality for:
 - Loading and parsing price data from JSON files
 - Date mapping (test dates to relative dates: yesterday/today/tomorrow)
 - Filtering based on start_graph_at settings
+- Importing the component modules without Home Assistant
+- Loading camera.py's hourly aggregation without Home Assistant (with a bytecode cache)
 """
+import ast
 import datetime
+import importlib.util
 import json
+import marshal
+import sys
+import textwrap
+import types
+from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 
-from dateutil import parser, tz
+from dateutil import tz
+
+# Prefer orjson for JSON parsing when available (orjson.JSONDecodeError subclasses json.JSONDecodeError)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 
 # Reuse local timezone object
 LOCAL_TZ = tz.tzlocal()
 
+# Component directory of the Home Assistant integration
+COMPONENT_DIR = Path(__file__).parent.parent / "custom_components" / "tibber_graph"
+
+# Compiled component source extracts are cached here between runs
+RENDER_CACHE_DIR = Path(__file__).parent / ".render_cache"
+
+
+def ensure_timezone(dt, tz_info=None):
+    """Ensure a datetime object has timezone information.
+
+    Stand-in for helpers.ensure_timezone, which cannot be imported without Home Assistant.
+
+    Args:
+        dt: datetime object to check
+        tz_info: timezone to apply if missing (defaults to LOCAL_TZ)
+
+    Returns:
+        datetime object with timezone information
+    """
+    if tz_info is None:
+        tz_info = LOCAL_TZ
+    # For Python 3.11+, use replace() for all timezone objects
+    return dt if dt.tzinfo else dt.replace(tzinfo=tz_info)
+
+
+def register_component_package() -> None:
+    """Make the component importable as a "tibber_graph" package.
+
+    The component directory is exposed as a package so that defaults.py,
+    const.py, themes.py and renderer.py are imported normally (with .pyc
+    caching) and their relative imports resolve. helpers.py depends on Home
+    Assistant, so it is replaced by a module providing only ensure_timezone.
+    Calling this more than once is a no-op.
+    """
+    if "tibber_graph" in sys.modules:
+        return
+
+    package = types.ModuleType("tibber_graph")
+    package.__path__ = [str(COMPONENT_DIR)]
+    sys.modules["tibber_graph"] = package
+
+    helpers = types.ModuleType("tibber_graph.helpers")
+    helpers.ensure_timezone = ensure_timezone
+    sys.modules["tibber_graph.helpers"] = helpers
+
 
 def parse_time_string(time_str: str, reference_date: datetime.date) -> Optional[datetime.datetime]:
     """Parse a time string (HH:MM or HH:MM:SS) into a datetime on the reference date.
@@ -114,12 +175,20 @@ def should_include_date(
     return mapped_date in (today, tomorrow)
 
 
+def _parse_start_time(value: str) -> datetime.datetime:
+    """Parse an ISO 8601 'start_time', accepting a trailing 'Z' on Python < 3.11."""
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return datetime.datetime.fromisoformat(value)
+
+
 def parse_price_entry(
     entry: dict,
     date_mapping: Dict[datetime.date, datetime.date],
     reference_date: datetime.date,
     start_graph_at: Optional[str] = None,
-    include_all: bool = False
+    include_all: bool = False,
+    start_time: Optional[datetime.datetime] = None
 ) -> Optional[Tuple[datetime.datetime, float]]:
     """Parse a single price entry from JSON and apply date mapping/filtering.
 
@@ -129,13 +198,14 @@ def parse_price_entry(
         reference_date: Reference date to use as "today"
         start_graph_at: Optional start_graph_at setting
         include_all: If True, include all dates regardless of filtering
+        start_time: Already parsed 'start_time' of the entry (parsed from the entry if omitted)
 
     Returns:
         Tuple of (datetime, price) if entry should be included, None otherwise
     """
     try:
-        # Parse the timestamp from JSON
-        dt = parser.isoparse(entry['start_time'])
+        # Parse the timestamp from JSON (ISO 8601)
+        dt = start_time if start_time is not None else _parse_start_time(entry['start_time'])
         # Convert to local timezone
         dt_local = dt.astimezone(LOCAL_TZ)
 
@@ -151,8 +221,8 @@ def parse_price_entry(
         if not should_include_date(mapped_date, reference_date, start_graph_at, include_all):
             return None
 
-        # Apply the mapped date
-        dt_local = dt_local.replace(year=mapped_date.year, month=mapped_date.month, day=mapped_date.day)
+        # Apply the mapped date (shifts the wall-clock date, keeping the time of day)
+        dt_local = dt_local + (mapped_date - original_date)
 
         # Extract price
         price = float(entry['price'])
@@ -185,16 +255,16 @@ def load_price_data_from_json(
     """
     # Load from JSON file
     try:
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            price_data_json = json.load(f)
+        price_data_json = _json_loads(Path(json_file_path).read_bytes())
     except (FileNotFoundError, json.JSONDecodeError) as e:
         raise RuntimeError(f"Failed to load price data from {json_file_path}: {e}")
 
-    # Find unique dates in the JSON data
-    unique_dates = set()
-    for entry in price_data_json:
-        dt = parser.isoparse(entry['start_time'])
-        unique_dates.add(dt.date())
+    # Parse each timestamp once and find unique dates in the JSON data
+    parsed_entries = [
+        (_parse_start_time(entry['start_time']), entry)
+        for entry in price_data_json
+    ]
+    unique_dates = {dt.date() for dt, _ in parsed_entries}
 
     # Sort dates to establish mapping
     sorted_dates = sorted(unique_dates)
@@ -205,11 +275,96 @@ def load_price_data_from_json(
     # Parse all entries
     dates = []
     prices = []
-    for entry in price_data_json:
-        result = parse_price_entry(entry, date_mapping, reference_date, start_graph_at, include_all)
+    for dt, entry in parsed_entries:
+        result = parse_price_entry(entry, date_mapping, reference_date, start_graph_at, include_all, start_time=dt)
         if result:
             dt_local, price = result
             dates.append(dt_local)
             prices.append(price)
 
     return dates, prices, date_mapping
+
+
+def load_cached_code(path: Path, rewrite_fn=None):
+    """Return a code object for a component source file, using an on-disk cache.
+
+    The cache entry is keyed on the source file's mtime and size, this module's
+    mtime (which holds the rewrite rules) and the interpreter's bytecode magic
+    number. On a miss the source is read, optionally passed through
+    `rewrite_fn`, compiled and marshalled to disk.
+
+    Args:
+        path: Path to the component source file
+        rewrite_fn: Optional function taking and returning the source string
+
+    Returns:
+        Compiled code object ready to be passed to exec()
+    """
+    source_stat = path.stat()
+    cache_key = repr((
+        importlib.util.MAGIC_NUMBER,
+        source_stat.st_mtime_ns,
+        source_stat.st_size,
+        Path(__file__).stat().st_mtime_ns,
+    )).encode()
+    cache_file = RENDER_CACHE_DIR / f"{path.stem}.code"
+
+    try:
+        cached = cache_file.read_bytes()
+        header, _, payload = cached.partition(b"\n")
+        if header == cache_key:
+            return marshal.loads(payload)
+    except (OSError, ValueError, EOFError, TypeError):
+        pass
+
+    source = path.read_text(encoding='utf-8')
+    if rewrite_fn is not None:
+        source = rewrite_fn(source)
+    code = compile(source, str(path), 'exec')
+
+    try:
+        RENDER_CACHE_DIR.mkdir(exist_ok=True)
+        cache_file.write_bytes(cache_key + b"\n" + marshal.dumps(code))
+    except OSError:
+        pass  # Caching is best effort
+
+    return code
+
+
+def extract_aggregate_to_hourly(camera_code: str) -> str:
+    """Extract the _aggregate_to_hourly static method from camera.py as a module-level function.
+
+    Args:
+        camera_code: Source code of camera.py
+
+    Returns:
+        Source code defining aggregate_to_hourly(dates, prices)
+
+    Raises:
+        ValueError: If camera.py has no _aggregate_to_hourly function
+    """
+    for node in ast.walk(ast.parse(camera_code)):
+        if isinstance(node, ast.FunctionDef) and node.name == '_aggregate_to_hourly':
+            # The segment excludes the @staticmethod decorator; padding keeps the
+            # first line indented like the body so dedent works
+            method_code = textwrap.dedent(ast.get_source_segment(camera_code, node, padded=True))
+            return method_code.replace('def _aggregate_to_hourly', 'def aggregate_to_hourly', 1)
+
+    raise ValueError("_aggregate_to_hourly not found in camera.py")
+
+
+def load_aggregate_to_hourly(camera_file: Path):
+    """Load camera.py's _aggregate_to_hourly without importing Home Assistant.
+
+    Only the static method is extracted and executed, so the local tools use
+    the exact same aggregation logic as the real component.
+
+    Args:
+        camera_file: Path to the component's camera.py
+
+    Returns:
+        The aggregate_to_hourly(dates, prices) function
+    """
+    namespace = {}
+    exec(load_cached_code(camera_file, extract_aggregate_to_hourly), namespace)
+    return namespace['aggregate_to_hourly']